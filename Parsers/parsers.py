@@ -1,8 +1,59 @@
 import os
 import re
+import copy
+import itertools
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 import numpy as np
 import xarray as xr
 import pandas as pd
+import pyarrow as pa
+import pyarrow.csv
+
+
+def _without_data(parser):
+    """Shallow copy of the parser without any loaded data, to hand to worker processes"""
+    parser = copy.copy(parser)
+    parser.DATA = None
+    return parser
+
+
+def _parse_files(parse: Callable[[str], object], files: list[str]) -> Iterator[tuple]:
+    """
+    Parse each file, yielding the file and its parsed data in order as each one
+    is done. Several files are parsed in parallel worker processes, while a
+    single file is parsed directly to avoid starting the workers
+    """
+    if len(files) <= 1:
+        for file in files:
+            yield file, parse(file)
+        return
+
+    with ProcessPoolExecutor() as executor:
+        yield from zip(files, executor.map(parse, files))
+
+
+def _parse_timestamps(timestamps: pd.Series, timestamp_format: str) -> pd.Series:
+    """
+    Parse the timestamps with their expected format, falling back to parsing
+    each timestamp on its own if any of them are written differently (e.g. with
+    a tab between the date and the time)
+    """
+    try:
+        return pd.to_datetime(timestamps, format=timestamp_format, cache=True)
+    except ValueError:
+        return pd.to_datetime(timestamps, format='mixed', cache=True)
+
+
+def _is_float(value) -> bool:
+    """Check if value is a string that float() accepts"""
+    if not isinstance(value, str):
+        return False
+    try:
+        float(value)
+        return True
+    except ValueError:
+        return False
 
 
 class VELPTA():
@@ -32,21 +83,37 @@ class VELPTA():
             "DIRECTION": 19
         }
 
+        # Column names ordered by their index, computed once
+        self._columns = sorted(self.DATA_INDEX, key=self.DATA_INDEX.get)
+
+        # Columns of the .dat file holding the parts of the DATETIME
+        self.DATETIME_PARTS = ["month", "day", "year", "hour", "minute", "second"]
+
         self.DATA = None
 
     def parse_velpt(self, filepath: str) -> pd.DataFrame:
         """Parse NORTEK AQUADOPP VELPT .dat recovered instrument file"""
 
-        # Open the .dat file
-        columns = pd.Series(data=self.DATA_INDEX.keys(), index=self.DATA_INDEX.values()).sort_index().to_list()
-        data = pd.read_csv(filepath, delim_whitespace=True, header=None, parse_dates=[[0, 1, 2, 3, 4, 5]])
+        # Open the .dat file, where the datetime is split across the first six columns
+        data = pd.read_csv(filepath, sep=r'\s+', header=None, names=self.DATETIME_PARTS + self._columns[1:])
+
+        # Assemble the Datetime column from its parts with integer datetime arithmetic
+        month, day, year, hour, minute, second = (data[part].to_numpy() for part in self.DATETIME_PARTS)
+        months = (year - 1970).astype('datetime64[Y]') + (month - 1).astype('timedelta64[M]')
 
-        # Rename the columns
-        for n, col in enumerate(data.columns):
-            data.rename(columns={col: columns[n]}, inplace=True)
+        # The arithmetic would roll invalid dates over into the next month or
+        # year, so check that every part is in range first
+        days_in_month = ((months + 1).astype('datetime64[D]') - months.astype('datetime64[D]')).astype(int)
+        valid = ((month >= 1) & (month <= 12) & (day >= 1) & (day <= days_in_month)
+                 & (hour >= 0) & (hour < 24) & (minute >= 0) & (minute < 60) & (second >= 0) & (second < 60))
+        if not valid.all():
+            line = np.flatnonzero(~valid)[0] + 1
+            raise ValueError(f"Invalid date/time on line {line} of {filepath}")
 
-        # Parse the Datetime columns
-        data["DATETIME"] = data["DATETIME"].apply(lambda x: pd.to_datetime(x, format="%m %d %Y %H %M %S"))
+        datetime = (months + (day - 1).astype('timedelta64[D]') + hour.astype('timedelta64[h]')
+                    + minute.astype('timedelta64[m]') + second.astype('timedelta64[s]'))
+        data.insert(0, "DATETIME", datetime.astype('datetime64[ns]'))
+        data = data.drop(columns=self.DATETIME_PARTS)
 
         return data
     
@@ -59,11 +126,11 @@ class VELPTA():
         # Check if there is any data yet and if not, initialize an empty dataframe
         if self.DATA is None:
             self.DATA = pd.DataFrame()
-        
-        # Parse a given file and concatenate to existing dataframe
-        for file in files:
-            data = self.parse_velpt(file)
-            self.DATA = pd.concat([self.DATA, data])
+
+        # Parse the files in parallel, then concatenate everything with the existing data once
+        parser = _without_data(self)
+        frames = [self.DATA] + [data for _, data in _parse_files(parser.parse_velpt, files)]
+        self.DATA = pd.concat(frames, ignore_index=True, copy=False)
 
 
 class METBK():
@@ -86,19 +153,25 @@ class METBK():
             'WIND_EASTWARD': 9,
             'WIND_NORTHWARD': 10,
         }
+
+        # Column names ordered by their index, computed once
+        self._columns = sorted(self.DATA_INDEX, key=self.DATA_INDEX.get)
+
+        # Number of lines of a .log file parsed at a time
+        self.CHUNK_SIZE = 100000
         
         self.DATA_TYPES = {
             'TIMESTAMP': 'datetime64[ns]',
-            'BAROMETRIC_PRESSURE': float,
-            'RELATIVE_HUMIDITY': float,
-            'AIR_TEMPERATURE': float,
-            'LONGWAVE_IRRADIANCE': float,
-            'PRECIPITATION': float,
-            'SEA_SURFACE_TEMPERATURE': float,
-            'SEA_SURFACE_CONDUCTIVITY': float,
-            'SHORTWAVE_IRRADIANCE': float,
-            'WIND_EASTWARD': float,
-            'WIND_NORTHWARD': float,
+            'BAROMETRIC_PRESSURE': np.float32,
+            'RELATIVE_HUMIDITY': np.float32,
+            'AIR_TEMPERATURE': np.float32,
+            'LONGWAVE_IRRADIANCE': np.float32,
+            'PRECIPITATION': np.float32,
+            'SEA_SURFACE_TEMPERATURE': np.float32,
+            'SEA_SURFACE_CONDUCTIVITY': np.float32,
+            'SHORTWAVE_IRRADIANCE': np.float32,
+            'WIND_EASTWARD': np.float32,
+            'WIND_NORTHWARD': np.float32,
         }
 
         self.DATA_PATTERN = (r'(-*\d+\.\d+|NaN)' +  # BPR 
@@ -111,15 +184,23 @@ class METBK():
                             '\s*(-*\d+\.\d+|NaN)' +  # SWR 
                             '\s*(-*\d+\.\d+|NaN)' +  # We 
                             '\s*(-*\d+\.\d+|NaN)' +  # Wn 
-                            '.*?' + '\n')  # throw away batteries
+                            '[^\n]*' + '\n')  # throw away batteries
 
         self.TIMESTAMP_PATTERN = (r'\d{4}/\d{2}/\d{2}' +      # Date in yyyy/mm/dd
                                     '\s*\d{2}:\d{2}:\d{2}.\d+') # Time in HH:MM:SS.fff 
+        self.TIMESTAMP_FORMAT = '%Y/%m/%d %H:%M:%S.%f'
+
+        # Compile the patterns once: the timestamp on its own, and the timestamp
+        # followed by the data so that a whole file is matched in a single pass.
+        # The logs are plain ASCII, so skip the unicode character classes
+        self._ts_re = re.compile('(' + self.TIMESTAMP_PATTERN + ')', flags=re.ASCII)
+        self._line_re = re.compile('(' + self.TIMESTAMP_PATTERN + r')\s*' + self.DATA_PATTERN, flags=re.ASCII)
+        self._na_re = re.compile(r'Na ')
         
 
-    def parse_metbk(self, raw_data: list[str]) -> list[str]:
+    def parse_metbk(self, raw_data: list[str]) -> pd.DataFrame:
         """
-        Parses a line of METBK data into the individual sensor components
+        Parses the lines of METBK data into the individual sensor components
         
         Parameters
         ----------
@@ -129,44 +210,60 @@ class METBK():
             
         Returns
         -------
-        good_data: list[str]
-            A list containing the parsed lines of data from the metbk
-            .log file that contain metbk measurements
+        good_data: pd.DataFrame
+            A dataframe of strings containing the parsed lines of data from
+            the metbk .log file that have a timestamp. Lines without
+            measurements are filled with NaNs
             
         """
-        good_data = []
+        lines = pd.Series(raw_data, dtype=object)
+
+        # Only lines that end with a number contain data. to_numeric covers most
+        # of them; the few values it rejects or turns into NaN (e.g. "NaN") are
+        # checked with float() itself
+        last_value = lines.str.rsplit(n=1).str[-1]
+        has_data = pd.to_numeric(last_value, errors='coerce').notna().to_numpy()
+        has_data[~has_data] = [_is_float(value) for value in last_value[~has_data]]
+        has_data = pd.Series(has_data, index=lines.index)
+
+        # Replace Na with NaN, then match the timestamp and data of every line
+        good_data = lines.str.replace(self._na_re, 'NaN', regex=True).str.extract(self._line_re)
+
+        # Lines that end with a number but do not hold all of the data (e.g.
+        # truncated lines) have no useful information
+        keep = good_data[0].notna() | ~has_data
+        lines, has_data, good_data = lines[keep], has_data[keep], good_data[keep]
+        good_data = good_data.where(has_data)
+
+        # Keep every line with a parseable timestamp, even if it has no data. The
+        # timestamp was already captured for the lines with data, so only the
+        # remaining lines are matched again
+        no_data = good_data[0].isna()
+        good_data.loc[no_data, 0] = lines[no_data].str.extract(self._ts_re, expand=False)
+        good_data = good_data.dropna(subset=[0])
+        good_data.columns = self._columns
 
-        for line in raw_data:
-            if line is not None:
-                # Check if the line contains data
-                try:
-                    float(line.split()[-1])
-                    # Now, replace Na with NaN
-                    line = re.sub(r'Na ', 'NaN', line)
-                    # Next, match the timestamp
-                    timestamp = re.findall(self.TIMESTAMP_PATTERN, line)
-                    # Remove the timestamp from the data string
-                    line = re.sub(timestamp[0], '', line)
-                    # Get the data
-                    raw_data = re.findall(self.DATA_PATTERN, line)[0]
+        return good_data
 
-                except:
-                    # Check that there is parseable timestamp
-                    timestamp = re.findall(self.TIMESTAMP_PATTERN, line)
-                    if len(timestamp) != 0:
-                        # Create an empty array of all NaNs
-                        raw_data = ['NaN']*10
-                    else:
-                        # There is no useful information in the line
-                        line = None
+    def _convert_metbk(self, good_data: pd.DataFrame) -> pd.DataFrame:
+        """Convert the parsed METBK strings to the DATA_TYPES"""
+        # Parse the timestamps, with their known format wherever possible
+        timestamps = _parse_timestamps(good_data['TIMESTAMP'], self.TIMESTAMP_FORMAT)
+        return good_data.assign(TIMESTAMP=timestamps).astype(self.DATA_TYPES)
 
-                # Append the timestamp to the start of the list
-                if line is not None:
-                    raw_data = list(raw_data)
-                    raw_data.insert(0, timestamp[0])
-                    good_data.append(raw_data)
+    def _parse_metbk_file(self, file: str) -> pd.DataFrame:
+        """
+        Read and parse a single METBK .log file CHUNK_SIZE lines at a time,
+        converting each chunk to the DATA_TYPES so only the typed data is kept
+        """
+        frames = []
+        with open(file) as f:
+            while raw_data := list(itertools.islice(f, self.CHUNK_SIZE)):
+                frames.append(self._convert_metbk(self.parse_metbk(raw_data)))
 
-        return good_data
+        if not frames:
+            return self._convert_metbk(self.parse_metbk([]))
+        return pd.concat(frames, ignore_index=True, copy=False)
 
     def load_metbk(self, files: list[str]) -> pd.DataFrame:
         """
@@ -187,22 +284,20 @@ class METBK():
         if not isinstance(files, list):
             raise TypeError("Files must be a list of full file paths")
 
-        # Initialize the dataframe to store the data
-        metbk_columns = pd.Series(data=self.DATA_INDEX.keys(), index=self.DATA_INDEX.values()).to_list()
-        metbk_data = pd.DataFrame(columns=metbk_columns)
+        # Only the .log files contain data
+        log_files = [file for file in files if file.endswith(".log")]
 
-        for file in files:
-            if file.endswith(".log"):
-                print(f"Parsing {file.split('/')[-1]}")
-                with open(file) as f:
-                    raw_data = f.readlines()
-                    good_data = self.parse_metbk(raw_data)
-                # Put into dataframe
-                metbk_data = pd.concat([metbk_data, pd.DataFrame(good_data, columns=metbk_columns)])
-            else:
-                continue
+        # Parse the files in parallel
+        frames = []
+        for file, data in _parse_files(_without_data(self)._parse_metbk_file, log_files):
+            print(f"Parsed {file.split('/')[-1]}")
+            frames.append(data)
 
-        self.DATA = metbk_data.astype(self.DATA_TYPES)
+        # Put the already typed data into a single dataframe
+        if frames:
+            self.DATA = pd.concat(frames, ignore_index=True, copy=False)
+        else:
+            self.DATA = self._convert_metbk(self.parse_metbk([]))
 
 
 class WAVSS():
@@ -234,71 +329,90 @@ class WAVSS():
             'MEAN_SPREAD': 21
         }
 
+        # Column names ordered by their index, computed once
+        self._columns = sorted(self.DATA_INDEX, key=self.DATA_INDEX.get)
+
         self.DATA_TYPE = {
             'TIMESTAMP': 'datetime64[ns]',
             'RECORD_TYPE': str,
-            'INSTRUMENT_DATE': int,
-            'INSTRUMENT_TIME': int,
-            'INSTRUMENT_SERIAL': int,
+            'INSTRUMENT_DATE': np.int32,
+            'INSTRUMENT_TIME': np.int32,
+            'INSTRUMENT_SERIAL': np.int32,
             'BUOY_ID': str,
             'LATITUDE': None,
             'LONGITUDE': None,
-            'N_ZERO_CROSSINGS': int,
-            'AVERAGE_WAVE_HEIGHT': float,
-            'MEAN_SPECTRAL_PERIOD': float,
-            'MAXIMUM_WAVE_HEIGHT': float,
-            'SIGNIFICANT_WAVE_HEIGHT': float,
-            'SIGNIFICANT_PERIOD': float,
-            'AVERAGE_HEIGHT_10TH_HIGHEST': float,
-            'AVERAGE_PERIOD_10TH_HIGHEST': float,
-            'MEAN_WAVE_PERIOD': float,
-            'PEAK_PERIOD': float,
-            'TP5': float,
-            'HMO': float,
-            'MEAN_DIRECTION': float,
-            'MEAN_SPREAD': float
+            'N_ZERO_CROSSINGS': np.int32,
+            'AVERAGE_WAVE_HEIGHT': np.float32,
+            'MEAN_SPECTRAL_PERIOD': np.float32,
+            'MAXIMUM_WAVE_HEIGHT': np.float32,
+            'SIGNIFICANT_WAVE_HEIGHT': np.float32,
+            'SIGNIFICANT_PERIOD': np.float32,
+            'AVERAGE_HEIGHT_10TH_HIGHEST': np.float32,
+            'AVERAGE_PERIOD_10TH_HIGHEST': np.float32,
+            'MEAN_WAVE_PERIOD': np.float32,
+            'PEAK_PERIOD': np.float32,
+            'TP5': np.float32,
+            'HMO': np.float32,
+            'MEAN_DIRECTION': np.float32,
+            'MEAN_SPREAD': np.float32
         }
-        
+
+        self.TIMESTAMP_FORMAT = '%Y/%m/%d %H:%M:%S.%f'
+
+        # Types used to read the records with arrow; the timestamp and the
+        # remaining columns are kept as strings and converted on load
+        arrow_types = {np.int32: pa.int32(), np.float32: pa.float32()}
+        self._arrow_schema = pa.schema([(column, arrow_types.get(self.DATA_TYPE[column], pa.string()))
+                                        for column in self._columns])
         
     
-    def parse_wavss(self, raw_data: list[str]) -> list[str]:
+    def parse_wavss(self, raw_data: Iterable[str]) -> pd.DataFrame:
         """
         Parse the raw_data into the different measurements
         
         Parameters
         ----------
-        raw_data: list[str]
-            A list containing each line of the raw data from the wavss
-            .log file as a separate string
+        raw_data: Iterable[str]
+            An iterable, such as a list or an open file, yielding each line
+            of the raw data from the wavss .log file as a separate string
             
         Returns
         -------
-        good_data: list[str]
-            A list containing the parsed lines of data from the wavss
+        good_data: pd.DataFrame
+            A dataframe containing the parsed lines of data from the wavss
             .log file that contain wavss measurements
             
         """
-        good_data = []
+        return self._read_wavss(line.encode() for line in raw_data).to_pandas(self_destruct=True)
+
+    def _read_wavss(self, raw_data: Iterable[bytes]) -> pa.Table:
+        """Read the wavss measurements in the raw bytes lines into an arrow table"""
+        records = []
         for line in raw_data:
             
             # Check that its a wave_statistics measurement
-            if '$TSPWA' not in line:
+            if b'$TSPWA' not in line:
                 continue
 
-            # Dump everything after the "*"
-            line = re.sub(r'\*.*', '', line, flags=re.DOTALL)
-
-            # Split the data
-            line = re.split(r' \$|,', line)
-
-            # Check that it is a full data record. If not, return none
-            if len(line) != 22:
-                continue
-
-            # Parse the raw data into the data dictionary based on index
-            good_data.append(line)
-        
-        return good_data
+            # Dump everything after the "*" and separate the timestamp from the
+            # record with a comma, so that the line is a plain csv row
+            records.append(line.split(b'*', 1)[0].rstrip(b'\r\n').replace(b' $', b','))
+
+        if not records:
+            return self._arrow_schema.empty_table()
+
+        # Split the data with arrow, skipping any record that is not a full data record
+        return pa.csv.read_csv(
+            pa.BufferReader(b'\n'.join(records)),
+            read_options=pa.csv.ReadOptions(column_names=self._columns),
+            parse_options=pa.csv.ParseOptions(invalid_row_handler=lambda row: 'skip'),
+            convert_options=pa.csv.ConvertOptions(column_types=self._arrow_schema)
+        )
+
+    def _parse_wavss_file(self, file: str) -> pa.Table:
+        """Read and parse a single WAVSS .log file, streaming its lines as bytes"""
+        with open(file, 'rb') as f:
+            return self._read_wavss(f)
     
 
     def load_wavss(self, files: list) -> pd.DataFrame:
@@ -321,23 +435,24 @@ class WAVSS():
         if not isinstance(files, list):
             raise TypeError("Files must be a list of full file paths")
 
-        # Initialize the dataframe to store the data
-        columns = pd.Series(data=self.DATA_INDEX.keys(), index=self.DATA_INDEX.values()).to_list()
-        wavss_data = pd.DataFrame(columns=columns)
+        # Only the .log files contain data
+        log_files = [file for file in files if file.endswith(".log")]
 
-        for file in files:
-            if file.endswith(".log"):
-                print(f"Parsing {file.split('/')[-1]}")
-                with open(file) as f:
-                    raw_data = f.readlines()
-                    good_data = self.parse_wavss(raw_data)
-                # Put into dataframe
-                wavss_data = pd.concat([wavss_data, pd.DataFrame(good_data, columns=columns)])
-            else:
-                continue
+        # Parse the files in parallel into arrow tables
+        tables = []
+        for file, table in _parse_files(_without_data(self)._parse_wavss_file, log_files):
+            print(f"Parsed {file.split('/')[-1]}")
+            tables.append(table)
+
+        # Combine the tables without copying and put into a single dataframe
+        table = pa.concat_tables([self._arrow_schema.empty_table()] + tables)
+        wavss_data = table.to_pandas(self_destruct=True)
+
+        # Parse the timestamps, with their known format wherever possible
+        wavss_data['TIMESTAMP'] = _parse_timestamps(wavss_data['TIMESTAMP'], self.TIMESTAMP_FORMAT)
 
         # Convert the data types and return the data
-        self.DATA = wavss_data.astype(self.DATA_TYPE)
+        self.DATA = wavss_data.astype(self.DATA_TYPE, copy=False)
 
 class TURBD():
     def __init__(self):
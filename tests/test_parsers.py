@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from Parsers.parsers import METBK, VELPTA, WAVSS
+
+
+def test_parse_metbk_keeps_data_on_lines_ending_in_nan():
+    # A line without battery fields whose last measurement is missing
+    raw_data = ['2021/05/01 00:00:00.000 1.0 2.0 3.0 4.0 5.0 6.0 7.0 8.0 9.0 NaN\n']
+
+    good_data = METBK().parse_metbk(raw_data)
+
+    assert len(good_data) == 1
+    values = good_data.iloc[0, 1:].astype(float).to_numpy()
+    np.testing.assert_array_equal(values[:9], np.arange(1.0, 10.0))
+    assert np.isnan(values[9])
+
+
+def test_load_metbk_parses_timestamps_not_in_the_usual_format(tmp_path):
+    log_file = tmp_path / "metbk.log"
+    log_file.write_text('2021/05/01 00:00:00.500 1.0 2.0 3.0 4.0 5.0 6.0 7.0 8.0 9.0 10.0 12.5\n'
+                        '2021/05/01\t00:00:01.250 1.0 2.0 3.0 4.0 5.0 6.0 7.0 8.0 9.0 10.0 12.5\n')
+
+    metbk = METBK()
+    metbk.load_metbk([str(log_file)])
+
+    np.testing.assert_array_equal(metbk.DATA['TIMESTAMP'].to_numpy(),
+                                  np.array(['2021-05-01T00:00:00.500', '2021-05-01T00:00:01.250'],
+                                           dtype='datetime64[ns]'))
+
+
+def test_parse_metbk_drops_truncated_lines():
+    raw_data = ['2021/05/01 01:00:02.000 1.0 2.0 3.0 4.0 5.0 6.0 7.0 8.0 9.0 10.0\n',
+                '2021/05/01 01:00:03.000 1.0 2.0 3.0\n',
+                '2021/05/01 01:00:04.000 [metbk:DLOGP1]:Instrument Started\n']
+
+    good_data = METBK().parse_metbk(raw_data)
+
+    # The truncated line is dropped, while the line without any data is kept as NaNs
+    assert good_data['TIMESTAMP'].tolist() == ['2021/05/01 01:00:02.000', '2021/05/01 01:00:04.000']
+    assert good_data.iloc[1, 1:].isna().all()
+
+
+VELPT_LINE = ('{month} {day} 2021 {hour} 30 15 0 48 0.609 -0.240 -0.466 100 101 102 '
+              '12.3 1500.1 59.0 1.5 -2.5 10.1 8.6 0 0 0.5 270.0\n')
+
+
+def test_parse_velpt_builds_datetime(tmp_path):
+    dat_file = tmp_path / "velpt.dat"
+    dat_file.write_text(VELPT_LINE.format(month='02', day='28', hour='23')
+                        + VELPT_LINE.format(month='12', day=' 1', hour=' 0'))
+
+    data = VELPTA().parse_velpt(str(dat_file))
+
+    assert data.columns[0] == "DATETIME"
+    assert len(data.columns) == 20
+    np.testing.assert_array_equal(data["DATETIME"].to_numpy(),
+                                  np.array(['2021-02-28T23:30:15', '2021-12-01T00:30:15'],
+                                           dtype='datetime64[ns]'))
+    assert data["STATUS CODE"].tolist() == [48, 48]
+
+
+@pytest.mark.parametrize("month, day", [('02', '30'), ('13', '01'), ('00', '01'), ('04', '00')])
+def test_parse_velpt_rejects_invalid_dates(tmp_path, month, day):
+    dat_file = tmp_path / "velpt.dat"
+    dat_file.write_text(VELPT_LINE.format(month='01', day='01', hour='00')
+                        + VELPT_LINE.format(month=month, day=day, hour='00'))
+
+    with pytest.raises(ValueError, match="line 2"):
+        VELPTA().parse_velpt(str(dat_file))
+
+
+TSPWA_RECORD = (b'2021/05/01 00:00:00.000 $TSPWA,20210501,000000,05781,buoyID,,,187,'
+                b'1.59,5.95,2.83,5.07,0.45,6.14,8.70,7.11,2.17,6.79,6.03,2.79,16.37')
+
+
+def test_load_wavss_skips_short_records_and_strips_checksums(tmp_path):
+    log_file = tmp_path / "wavss.log"
+    log_file.write_bytes(TSPWA_RECORD + b'*5D\r\n'
+                         + b'2021/05/01 00:00:01.000 $TSPWA,20210501,000001,05781,buoyID,,,24,0.13*5D\r\n'
+                         + b'2021/05/01 00:00:02.000 [wavss:DLOGP5]:Idle\r\n'
+                         + TSPWA_RECORD.replace(b'00:00:00.000', b'00:00:03.000') + b'*6A\r\n')
+
+    wavss = WAVSS()
+    wavss.load_wavss([str(log_file)])
+
+    assert len(wavss.DATA) == 2
+    assert wavss.DATA['TIMESTAMP'].dt.second.tolist() == [0, 3]
+    # The checksum and line ending are not part of the last value
+    assert wavss.DATA['MEAN_SPREAD'].tolist() == [np.float32(16.37)] * 2
+
+
+def test_parse_wavss_column_types():
+    good_data = WAVSS().parse_wavss([TSPWA_RECORD.decode() + '*5D\n'])
+
+    row = good_data.iloc[0]
+    assert row['RECORD_TYPE'] == 'TSPWA'
+    assert row['BUOY_ID'] == 'buoyID'
+    assert row['LATITUDE'] == '' and row['LONGITUDE'] == ''
+    assert row['INSTRUMENT_TIME'] == 0
+    assert row['INSTRUMENT_SERIAL'] == 5781
+    assert row['N_ZERO_CROSSINGS'] == 187
+    for column in ['INSTRUMENT_DATE', 'INSTRUMENT_TIME', 'INSTRUMENT_SERIAL', 'N_ZERO_CROSSINGS']:
+        assert good_data[column].dtype == np.int32
+    assert (good_data.loc[:, 'AVERAGE_WAVE_HEIGHT':'MEAN_SPREAD'].dtypes == np.float32).all()